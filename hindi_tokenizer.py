@@ -1,12 +1,23 @@
+import mmap
+import os
+import random
 import re
 import requests
 from pathlib import Path
 from collections import defaultdict, Counter
+from itertools import islice
+from multiprocessing import Pool
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 import json
 import numpy as np
 
+# Everything preprocess_hindi_text drops: non-Hindi characters and digits
+# (English digits fall outside the kept set, Hindi digits \u0966-\u096F are
+# cut out of the Devanagari range). No callback is involved, so the whole
+# filter runs inside the regex engine in a single pass.
+_RE_DROP = re.compile(r"[^\u0900-\u0965\u0970-\u097F\s,.!?\-]+")
+
 class TrieNode:
     """Node in the prefix tree (trie) for fast token matching"""
     def __init__(self):
@@ -35,11 +46,13 @@ class BPETokenizer:
         
         self.original_length = 0
         self.max_token_length = 1
+        self._trie = None  # Cached vocabulary trie, reset whenever stoi changes
         
-    def initialize_vocab(self, text):
+    def initialize_vocab(self, text, preprocessed=False):
         """Initialize vocabulary from characters in text"""
-        # Preprocess text first
-        text = preprocess_hindi_text(text)
+        # Preprocess text first unless the caller already did
+        if not preprocessed:
+            text = preprocess_hindi_text(text)
         
         # Get unique characters and add special tokens
         chars = sorted(list(set(text)))
@@ -48,9 +61,19 @@ class BPETokenizer:
         # Create mappings
         self.stoi = {ch: i for i, ch in enumerate(all_tokens)}
         self.itos = {i: ch for i, ch in enumerate(all_tokens)}
-        
-        # Initial encoding
-        self.data = [self.stoi[c] for c in text]
+        self._trie = None
+        
+        # Initial encoding, a block at a time so that no corpus-sized
+        # Python list or index array is ever built
+        lookup = np.zeros(ord(chars[-1]) + 1 if chars else 0, dtype=np.int32)
+        lookup[[ord(c) for c in chars]] = [self.stoi[c] for c in chars]
+        self.data = np.empty(len(text), dtype=np.int32)
+        block_size = 1 << 24
+        for start in range(0, len(text), block_size):
+            codepoints = np.frombuffer(
+                text[start:start + block_size].encode("utf-32-le"), dtype=np.uint32
+            )
+            self.data[start:start + len(codepoints)] = lookup[codepoints]
         self.original_length = len(self.data)
         
         # Initialize stats
@@ -90,20 +113,34 @@ class BPETokenizer:
         next_idx = len(self.itos)
         self.stoi[pair_str] = next_idx
         self.itos[next_idx] = pair_str
+        self._trie = None
         
         # Update max token length
         self.max_token_length = max(self.max_token_length, len(pair_str))
         return next_idx
     
-    def train(self, texts, min_frequency=2, print_interval=500):
-        """Optimized BPE training with vectorized operations"""
+    def train(self, texts, min_frequency=2, print_interval=500, preprocessed=False):
+        """
+        Optimized BPE training with vectorized operations.
+        
+        Pass preprocessed=True when texts are lines already cleaned by
+        preprocess_hindi_text (e.g. the preprocessed shards) to skip a second,
+        single-threaded cleaning pass over the whole corpus.
+        """
         # Combine all texts and initialize vocab
         print("Initializing vocabulary...")
-        full_text = " ".join(texts)
-        self.initialize_vocab(full_text)
+        # The joined text is passed straight through so it is freed as soon
+        # as the initial encoding is done
+        if preprocessed:
+            # Cleaned lines only need their line breaks dropped
+            self.initialize_vocab(
+                " ".join(line.rstrip("\n") for line in texts), preprocessed=True
+            )
+        else:
+            self.initialize_vocab(" ".join(texts))
         
         # Convert data to numpy array for faster operations
-        data = np.array(self.data, dtype=np.int32)
+        data = np.asarray(self.data, dtype=np.int32)
         
         # Pre-compute character frequencies using numpy
         print("Computing initial frequencies...")
@@ -301,8 +338,55 @@ class BPETokenizer:
         
         return instance
     
-    def encode(self, text: str):
-        """Convert text to token indices"""
+    def _build_trie(self):
+        """Build a prefix tree over the vocabulary for longest-match lookup"""
+        root = TrieNode()
+        for token in self.stoi:
+            node = root
+            for ch in token:
+                child = node.children.get(ch)
+                if child is None:
+                    child = node.children[ch] = TrieNode()
+                node = child
+            node.is_token = True
+            node.token = token
+        return root
+    
+    def _get_trie(self):
+        """Return the vocabulary trie, building it only after the vocabulary changed"""
+        if self._trie is None:
+            self._trie = self._build_trie()
+        return self._trie
+    
+    def _encode_word(self, word, root):
+        """Greedy longest-match encoding of a single word using the vocabulary trie"""
+        tokens = []
+        token_ids = []
+        
+        i = 0
+        while i < len(word):
+            # Walk the trie to find the longest matching token
+            longest_match = None
+            node = root
+            for ch in word[i:]:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+                if node.is_token:
+                    longest_match = node.token
+            
+            if longest_match:
+                tokens.append(longest_match)
+                token_ids.append(self.stoi[longest_match])
+                i += len(longest_match)
+            else:
+                # Skip unknown character and continue
+                i += 1
+        
+        return token_ids, tokens
+    
+    def _encode_words(self, text, root, cache):
+        """Encode text word by word, reusing encodings of repeated words from cache"""
         # Preprocess input text
         text = preprocess_hindi_text(text)
         
@@ -313,25 +397,24 @@ class BPETokenizer:
         words = text.split()
         
         for word in words:
-            # Try to find longest matching token
-            while word:
-                longest_match = None
-                for token, idx in sorted(self.stoi.items(), key=lambda x: len(x[0]), reverse=True):
-                    if word.startswith(token):
-                        longest_match = (token, idx)
-                        break
-                
-                if longest_match:
-                    token, idx = longest_match
-                    tokens.append(token)
-                    token_ids.append(idx)
-                    word = word[len(token):]
-                else:
-                    # Skip unknown character and continue
-                    word = word[1:]
+            encoded = cache.get(word)
+            if encoded is None:
+                encoded = cache[word] = self._encode_word(word, root)
+            token_ids.extend(encoded[0])
+            tokens.extend(encoded[1])
         
         return token_ids, tokens
     
+    def encode(self, text: str):
+        """Convert text to token indices"""
+        return self._encode_words(text, self._get_trie(), {})
+    
+    def encode_batch(self, texts):
+        """Convert a batch of texts to token indices, sharing the word cache"""
+        root = self._get_trie()
+        cache = {}
+        return [self._encode_words(text, root, cache) for text in texts]
+    
     def decode(self, token_ids: list) -> str:
         """Convert token indices back to text with better error handling"""
         decoded_tokens = []
@@ -360,14 +443,20 @@ class BPETokenizer:
         result = " ".join(result.split())
         return result
 
-def download_dataset(url, filepath, max_size_gb=2):
+def download_dataset(url, filepath, max_size_gb=2, session=None):
     """
     Downloads a portion of the dataset with size limit and resume capability.
     
+    Fresh downloads ask for a gzip/deflate encoded body, which requests
+    decompresses transparently. Resumed downloads ask for the identity
+    encoding, since Range offsets refer to the bytes as sent.
+    
     Args:
         url (str): URL of the dataset
         filepath (Path): Path where the file should be saved
         max_size_gb (float): Maximum size to download in gigabytes
+        session (requests.Session, optional): Session to reuse for connection pooling.
+            If None, a session is created for this download and closed afterwards
     """
     max_size_bytes = max_size_gb * 1024 * 1024 * 1024  # Convert GB to bytes
     
@@ -382,71 +471,266 @@ def download_dataset(url, filepath, max_size_gb=2):
     current_size = filepath.stat().st_size if filepath.exists() else 0
     
     # Set up headers for resume
-    headers = {'Range': f'bytes={current_size}-'} if current_size > 0 else {}
+    if current_size > 0:
+        headers = {'Range': f'bytes={current_size}-', 'Accept-Encoding': 'identity'}
+    else:
+        headers = {'Accept-Encoding': 'gzip, deflate'}
+    
+    own_session = session is None
+    if own_session:
+        session = requests.Session()
     
     try:
-        response = requests.get(url, stream=True, headers=headers)
-        response.raise_for_status()
-        
-        # Get file size for progress bar
-        total_size = min(
-            int(response.headers.get('content-length', 0)) + current_size,
-            max_size_bytes
-        )
-        
-        mode = 'ab' if current_size > 0 else 'wb'
-        with open(filepath, mode) as file, tqdm(
-            desc="Downloading",
-            initial=current_size,
-            total=total_size,
-            unit='iB',
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as progress_bar:
-            for data in response.iter_content(chunk_size=8192):
-                if not data:
-                    break
+        # Closing the response returns the connection to the session pool,
+        # including when the size limit stops the download early
+        with session.get(url, stream=True, headers=headers) as response:
+            response.raise_for_status()
+            
+            # Get file size for progress bar; for an encoded body content-length
+            # is the compressed size, so fall back to the size limit
+            if response.headers.get('content-encoding', 'identity') != 'identity':
+                total_size = max_size_bytes
+            else:
+                total_size = min(
+                    int(response.headers.get('content-length', 0)) + current_size,
+                    max_size_bytes
+                )
+            
+            mode = 'ab' if current_size > 0 else 'wb'
+            chunk_size = 1 << 20
+            chunks_per_update = 16
+            with open(filepath, mode, buffering=chunk_size) as file, tqdm(
+                desc="Downloading",
+                initial=current_size,
+                total=total_size,
+                unit='iB',
+                unit_scale=True,
+                unit_divisor=1024,
+            ) as progress_bar:
+                pending = 0
+                for i, data in enumerate(response.iter_content(chunk_size=chunk_size), 1):
+                    if not data:
+                        break
+                        
+                    pending += file.write(data)
                     
-                size = file.write(data)
-                progress_bar.update(size)
+                    # Update the progress bar every few chunks
+                    if i % chunks_per_update == 0:
+                        progress_bar.update(pending)
+                        pending = 0
+                    
+                    # Check if we've reached the size limit
+                    if file.tell() >= max_size_bytes:
+                        print(f"\nReached {max_size_gb}GB limit, stopping download.")
+                        break
                 
-                # Check if we've reached the size limit
-                if file.tell() >= max_size_bytes:
-                    print(f"\nReached {max_size_gb}GB limit, stopping download.")
-                    break
+                progress_bar.update(pending)
                     
     except requests.exceptions.RequestException as e:
         print(f"Error during download: {e}")
         if filepath.exists():
             print("Partial download remains available for resume.")
         raise
+    finally:
+        if own_session:
+            session.close()
+
+def default_num_workers():
+    """
+    Picks the number of preprocessing workers: one per CPU this process may use.
+    
+    Counts only the CPUs in the process affinity mask where the OS reports
+    one, so cpuset limits in containers are respected.
+    
+    Returns:
+        int: Number of worker processes to use
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
 
-def prepare_dataset(input_path, sample_size=None, max_lines=None):
+def iter_lines(input_path, max_lines=None, sample_size=None):
     """
-    Prepares the dataset by optionally sampling and basic cleaning.
+    Streams non-empty lines from the raw dataset.
+    
+    When sample_size is given, a uniform random sample of the non-empty lines
+    is drawn with reservoir sampling in a single pass and yielded in random
+    order, keeping at most sample_size lines in memory.
     
     Args:
         input_path (Path): Path to the raw dataset
-        sample_size (int, optional): Number of lines to sample. If None, use entire dataset
         max_lines (int, optional): Maximum number of lines to read from file
+        sample_size (int, optional): Number of lines to sample. If None, use entire dataset
     
-    Returns:
-        list: Processed lines from the dataset
+    Yields:
+        str: Raw lines from the dataset
     """
-    print("Reading and preparing dataset...")
-    lines = []
+    reservoir = []
     
     with open(input_path, 'r', encoding='utf-8') as file:
+        seen = 0
         for i, line in enumerate(tqdm(file, desc="Reading lines")):
             if max_lines and i >= max_lines:
                 break
                 
-            if line.strip():
-                lines.append(line)
-                if sample_size and len(lines) >= sample_size:
+            if not line.strip():
+                continue
+            
+            if not sample_size:
+                yield line
+                continue
+            
+            seen += 1
+            if len(reservoir) < sample_size:
+                reservoir.append(line)
+            else:
+                j = random.randrange(seen)
+                if j < sample_size:
+                    reservoir[j] = line
+    
+    random.shuffle(reservoir)
+    yield from reservoir
+
+def shard_paths(output_path):
+    """
+    Lists the existing preprocessed shards for output_path, in shard order.
+    
+    Shard i of "output/preprocessed_hindi.txt" is "output/preprocessed_hindi.i.txt".
+    
+    Args:
+        output_path (Path): Base path of the preprocessed dataset
+    
+    Returns:
+        list: Paths of the shards found on disk
+    """
+    shards = []
+    for path in output_path.parent.glob(f"{output_path.stem}.*{output_path.suffix}"):
+        index = path.name[len(output_path.stem) + 1:len(path.name) - len(output_path.suffix)]
+        if index.isdigit():
+            shards.append((int(index), path))
+    return [path for _, path in sorted(shards)]
+
+def iter_shards(paths):
+    """
+    Streams lines from a list of preprocessed shards.
+    
+    Args:
+        paths (list): Paths of the shards to read
+    
+    Yields:
+        str: Lines from each shard in turn
+    """
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as file:
+            yield from file
+
+def _preprocess_to_shard(lines, shard_path):
+    """Clean a batch of lines in a worker and append them to its shard"""
+    written = 0
+    with open(shard_path, "a", encoding="utf-8", buffering=1 << 20) as out:
+        for line in lines:
+            cleaned = preprocess_hindi_text(line)
+            if cleaned:
+                out.write(cleaned)
+                out.write("\n")
+                written += 1
+    return written
+
+def unique_lines(lines):
+    """
+    Drops repeated lines, ignoring surrounding whitespace. Meant for cleaned
+    lines, where text that cleans to the same string counts as a repeat.
+    
+    Only the hash of each line is remembered, so a hash collision can drop a
+    distinct line; that is an acceptable approximation for training data.
+    
+    Args:
+        lines (iterable): Lines to deduplicate
+    
+    Yields:
+        str: First occurrence of each line
+    """
+    seen = set()
+    for line in lines:
+        key = hash(line.strip())
+        if key in seen:
+            continue
+        seen.add(key)
+        yield line
+
+def preprocess_dataset(input_path, output_path, sample_size=None, max_lines=None,
+                       num_shards=None, batch_size=1 << 16):
+    """
+    Cleans the raw dataset line by line and writes it straight to disk in shards.
+    
+    Each round hands one batch of lines to every worker, and each worker
+    appends its cleaned batch to its own shard, so cleaned text never has
+    to travel back to the main process. Shards only appear under their
+    final names once the whole dataset has been processed; if nothing is
+    left after cleaning, ValueError is raised and existing shards are kept. Apart from the sample itself, memory
+    stays bounded by num_shards * batch_size lines.
+    
+    Args:
+        input_path (Path): Path to the raw dataset
+        output_path (Path): Base path of the preprocessed dataset (see shard_paths)
+        sample_size (int, optional): Number of lines to sample. If None, use entire dataset
+        max_lines (int, optional): Maximum number of lines to read from file
+        num_shards (int, optional): Number of shards and workers. Defaults to default_num_workers()
+        batch_size (int): Number of lines sent to a worker at a time
+    
+    Returns:
+        list: Paths of the written shards
+    """
+    print("Reading and preparing dataset...")
+    num_shards = num_shards or default_num_workers()
+    lines = iter_lines(input_path, max_lines=max_lines, sample_size=sample_size)
+    
+    # Shards are written under temporary names and only renamed once every
+    # line is done, so an interrupted run never leaves shards that look complete
+    paths = [
+        output_path.with_name(f"{output_path.stem}.{i}{output_path.suffix}")
+        for i in range(num_shards)
+    ]
+    temp_paths = [path.with_name(path.name + ".tmp") for path in paths]
+    for path in output_path.parent.glob(f"{output_path.stem}.*{output_path.suffix}.tmp"):
+        path.unlink()
+    
+    try:
+        with Pool(num_shards) as pool:
+            while True:
+                jobs = []
+                for path in temp_paths:
+                    batch = list(islice(lines, batch_size))
+                    if not batch:
+                        break
+                    jobs.append((batch, path))
+                
+                if not jobs:
                     break
+                pool.starmap(_preprocess_to_shard, jobs)
+    except BaseException:
+        for path in temp_paths:
+            path.unlink(missing_ok=True)
+        raise
     
-    return lines
+    # Keep the shards of the last complete run if this one produced nothing
+    if not any(path.exists() for path in temp_paths):
+        raise ValueError(f"No non-empty lines left after cleaning '{input_path}'")
+    
+    # Publish the new shards, then drop shards from previous runs, which may
+    # have used a different count. Workers create a shard on its first batch,
+    # so small inputs may not reach every shard.
+    stale = shard_paths(output_path)
+    written = []
+    for temp_path, path in zip(temp_paths, paths):
+        if temp_path.exists():
+            os.replace(temp_path, path)
+            written.append(path)
+    for path in stale:
+        if path not in written:
+            path.unlink()
+    
+    return written
 
 def preprocess_hindi_text(text):
     """
@@ -458,39 +742,77 @@ def preprocess_hindi_text(text):
     Returns:
         str: Cleaned and normalized text
     """
-    # Remove <unk> tokens first
-    text = text.replace("<unk>", "")
-    
-    # Retain Hindi characters and punctuation
-    text = re.sub(r"[^\u0900-\u097F\s।,.!?\-]", "", text)
-    # Remove digits (both English and Hindi)
-    text = re.sub(r"[0-9०-९]", "", text)
+    # Retain Hindi characters and punctuation, remove digits (both English
+    # and Hindi); "<unk>" tokens are dropped too
+    text = _RE_DROP.sub("", text)
     # Normalize full stops and whitespace
-    text = re.sub(r"।", ".", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return " ".join(text.replace("।", ".").split())
 
-def calculate_compression_ratio(tokenizer, corpus_path):
+def iter_chunks(mm, chunk_size):
+    """
+    Splits a memory-mapped UTF-8 file into decoded chunks cut at line boundaries.
+    
+    Args:
+        mm (mmap.mmap): Memory-mapped file
+        chunk_size (int): Approximate number of bytes per chunk
+    
+    Yields:
+        str: Decoded chunks, each ending at a newline or the end of the file
+    """
+    start = 0
+    while start < len(mm):
+        end = mm.find(b"\n", start + chunk_size)
+        end = len(mm) if end == -1 else end + 1
+        yield mm[start:end].decode("utf-8")
+        start = end
+
+def calculate_compression_ratio(tokenizer, corpus_paths, chunk_size=4 << 20, chunks_per_batch=4):
     """
     Calculates the compression ratio for the tokenizer on the given corpus.
     
+    Each shard is memory-mapped and read in large chunks cut at line
+    boundaries. Each chunk is encoded as a single text, so per-call overhead
+    is paid per chunk rather than per line. Repeated words within a batch
+    are encoded once. Characters and tokens are summed over all shards
+    before dividing.
+    
     Args:
         tokenizer (Tokenizer): Trained BPE tokenizer
-        corpus_path (str): Path to the preprocessed corpus
+        corpus_paths (list or str or Path): Paths of the preprocessed shards, e.g. from
+            shard_paths(), or a single path to one preprocessed file
+        chunk_size (int): Approximate number of bytes per chunk
+        chunks_per_batch (int): Number of chunks encoded per encode_batch call
     
     Returns:
         float: Compression ratio (characters/tokens)
     """
-    with open(corpus_path, "r", encoding="utf-8") as file:
-        corpus = file.readlines()
+    if isinstance(corpus_paths, (str, os.PathLike)):
+        corpus_paths = [corpus_paths]
+    
+    total_chars = 0
+    total_tokens = 0
+    
+    for corpus_path in corpus_paths:
+        with open(corpus_path, "rb") as file:
+            # mmap cannot map an empty file
+            if not os.fstat(file.fileno()).st_size:
+                continue
+            
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                chunks = iter_chunks(mm, chunk_size)
+                while True:
+                    batch = list(islice(chunks, chunks_per_batch))
+                    if not batch:
+                        break
+                    
+                    total_chars += sum(len(chunk) for chunk in batch)
+                    total_tokens += sum(len(tokens) for _, tokens in tokenizer.encode_batch(batch))
     
-    total_chars = sum(len(line) for line in corpus)
-    total_tokens = sum(len(tokenizer.encode(line).tokens) for line in corpus)
     return total_chars / total_tokens
 
 def encode_text(tokenizer, text):
-    cleaned_text = preprocess_hindi_text(text)
-    return tokenizer.encode(cleaned_text)
+    # BPETokenizer.encode cleans its input itself
+    return tokenizer.encode(text)
 
 def decode_text(tokenizer, token_ids):
     return tokenizer.decode(token_ids)
@@ -516,6 +838,23 @@ def test_tokenizer(tokenizer, test_text):
     decoded_text = decode_text(tokenizer, token_ids)
     print(f"\nDecoded Text: {decoded_text}")
 
+def is_up_to_date(target, source):
+    """
+    Checks whether a generated file is at least as new as the file it was built from.
+    
+    Args:
+        target (Path): Generated file
+        source (Path): File the target is generated from
+    
+    Returns:
+        bool: True if both files exist and target is not older than source
+    """
+    return (
+        target.exists()
+        and source.exists()
+        and source.stat().st_mtime <= target.stat().st_mtime
+    )
+
 def main():
     # Create output directory if it doesn't exist
     output_dir = Path("output")
@@ -539,37 +878,43 @@ def main():
     else:
         print("Sufficient dataset already exists, skipping download.")
     
-    # Step 2: Prepare and preprocess the dataset
-    print("Step 2: Preprocessing dataset...")
-    try:
-        # Sample 1 Million lines from the first 2 Million lines
-        raw_data = prepare_dataset(
-            raw_dataset_path,
-            sample_size=1_000_000,
-            max_lines=2_000_000
-        )
-    except FileNotFoundError:
-        print(f"Error: Input file '{raw_dataset_path}' not found!")
-        return
-    except Exception as e:
-        print(f"Error preparing dataset: {e}")
-        return
-
-    # Preprocess the text
-    print("Cleaning and normalizing text...")
-    preprocessed_data = [preprocess_hindi_text(line) for line in tqdm(raw_data)]
-
-    # Save the preprocessed dataset
-    with open(preprocessed_path, "w", encoding="utf-8") as file:
-        file.write("\n".join(preprocessed_data))
+    # Step 2: Prepare and preprocess the dataset unless the raw data hasn't changed
+    shards = shard_paths(preprocessed_path)
+    if shards and all(is_up_to_date(shard, raw_dataset_path) for shard in shards):
+        print("Preprocessed dataset is up to date, skipping preprocessing.")
+    else:
+        print("Step 2: Preprocessing dataset...")
+        try:
+            # Sample 1 Million lines from the whole dataset
+            shards = preprocess_dataset(
+                raw_dataset_path,
+                preprocessed_path,
+                sample_size=1_000_000
+            )
+        except FileNotFoundError:
+            print(f"Error: Input file '{raw_dataset_path}' not found!")
+            return
+        except Exception as e:
+            print(f"Error preparing dataset: {e}")
+            return
 
-    # Initialize and train our custom BPE tokenizer
-    tokenizer = BPETokenizer(vocab_size=4500)
-    tokenizer.train(preprocessed_data, min_frequency=2)
-    
-    # Save the tokenizer
+    # Step 3: Reuse the saved tokenizer if it was trained on the current corpus
     config_path = output_dir / "hindi_encoder.json"
-    tokenizer.save(str(config_path))
+    if not shards:
+        print(f"Error: No preprocessed text was produced from '{raw_dataset_path}'!")
+        return
+    if all(is_up_to_date(config_path, shard) for shard in shards):
+        print("Trained tokenizer is up to date, skipping training.")
+        tokenizer = load_tokenizer(str(config_path))
+    else:
+        # Initialize and train our custom BPE tokenizer
+        tokenizer = BPETokenizer(vocab_size=4500)
+        # Shard lines are already cleaned, so lines that only differed in
+        # digits, non-Hindi text or spacing are caught as duplicates here
+        tokenizer.train(unique_lines(iter_shards(shards)), min_frequency=2, preprocessed=True)
+        
+        # Save the tokenizer
+        tokenizer.save(str(config_path))
     
     # Test the tokenizer
     test_text = "नमस्ते भारत! यह एक परीक्षण वाक्य है।"